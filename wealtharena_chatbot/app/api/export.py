@@ -11,6 +11,8 @@ from fastapi import APIRouter, HTTPException, Query, Response
 from fastapi.responses import StreamingResponse
 import io
 
+from .history import get_connection
+
 router = APIRouter()
 
 # Database file path (same as history)
@@ -50,7 +52,7 @@ async def export_chat_history(
 ):
     """Export chat history for a specific user"""
     try:
-        conn = sqlite3.connect(DB_PATH)
+        conn = get_connection()
         cursor = conn.cursor()
         
         # Get chat history
@@ -63,7 +65,6 @@ async def export_chat_history(
         """, (user_id, limit))
         
         rows = cursor.fetchall()
-        conn.close()
         
         if not rows:
             raise HTTPException(status_code=404, detail="No chat history found for this user")
@@ -138,6 +139,7 @@ async def _export_csv(rows, filename):
 async def _export_json(rows, filename):
     """Export chat history as JSON"""
     import json
+    import orjson
     
     export_data = {
         "export_info": {
@@ -158,7 +160,7 @@ async def _export_json(rows, filename):
         
         if meta:
             try:
-                message_data["metadata"] = json.loads(meta)
+                message_data["metadata"] = orjson.loads(meta)
             except:
                 message_data["metadata"] = meta
         
@@ -178,48 +180,32 @@ async def get_export_summary(
 ):
     """Get a summary of exportable chat history"""
     try:
-        conn = sqlite3.connect(DB_PATH)
+        conn = get_connection()
         cursor = conn.cursor()
         
-        # Get basic stats
+        # Get basic, length and recent-activity stats in a single scan
         cursor.execute("""
             SELECT 
                 COUNT(*) as total_messages,
                 MIN(created_at) as first_message,
-                MAX(created_at) as last_message
-            FROM chat_history
-            WHERE user_id = ?
-        """, (user_id,))
-        
-        result = cursor.fetchone()
-        if not result or result[0] == 0:
-            raise HTTPException(status_code=404, detail="No chat history found for this user")
-        
-        total_messages, first_message, last_message = result
-        
-        # Get message length stats
-        cursor.execute("""
-            SELECT 
+                MAX(created_at) as last_message,
                 AVG(LENGTH(message)) as avg_user_message_length,
                 AVG(LENGTH(reply)) as avg_assistant_reply_length,
                 MAX(LENGTH(message)) as max_user_message_length,
-                MAX(LENGTH(reply)) as max_assistant_reply_length
+                MAX(LENGTH(reply)) as max_assistant_reply_length,
+                SUM(created_at >= datetime('now', '-7 days')) as recent_messages
             FROM chat_history
             WHERE user_id = ?
         """, (user_id,))
         
-        length_stats = cursor.fetchone()
-        
-        # Get recent activity (last 7 days)
-        cursor.execute("""
-            SELECT COUNT(*) as recent_messages
-            FROM chat_history
-            WHERE user_id = ? AND created_at >= datetime('now', '-7 days')
-        """, (user_id,))
+        result = cursor.fetchone()
         
-        recent_messages = cursor.fetchone()[0]
+        if not result or result[0] == 0:
+            raise HTTPException(status_code=404, detail="No chat history found for this user")
         
-        conn.close()
+        total_messages, first_message, last_message = result[:3]
+        length_stats = result[3:7]
+        recent_messages = result[7] or 0
         
         return {
             "user_id": user_id,
@@ -243,7 +229,7 @@ async def get_export_summary(
 async def bulk_export_all_users():
     """Export chat history for all users (admin endpoint)"""
     try:
-        conn = sqlite3.connect(DB_PATH)
+        conn = get_connection()
         cursor = conn.cursor()
         
         # Get all users with their message counts
@@ -259,7 +245,6 @@ async def bulk_export_all_users():
         """)
         
         users = cursor.fetchall()
-        conn.close()
         
         if not users:
             raise HTTPException(status_code=404, detail="No chat history found")
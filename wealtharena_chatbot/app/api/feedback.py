@@ -11,6 +11,8 @@ from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
 from enum import Enum
 
+from .history import get_connection
+
 router = APIRouter()
 
 # Database file path (same as history)
@@ -71,12 +73,11 @@ async def submit_feedback(request: FeedbackRequest):
     """Submit feedback for a chat message"""
     try:
         # First, verify that the message_id exists
-        conn = sqlite3.connect(DB_PATH)
+        conn = get_connection()
         cursor = conn.cursor()
         
         cursor.execute("SELECT id FROM chat_history WHERE id = ?", (request.message_id,))
         if not cursor.fetchone():
-            conn.close()
             raise HTTPException(status_code=404, detail="Message not found")
         
         # Insert feedback
@@ -87,7 +88,6 @@ async def submit_feedback(request: FeedbackRequest):
         
         feedback_id = cursor.lastrowid
         conn.commit()
-        conn.close()
         
         return FeedbackResponse(
             id=feedback_id,
@@ -105,13 +105,12 @@ async def submit_feedback(request: FeedbackRequest):
 async def get_feedback_stats(message_id: int):
     """Get feedback statistics for a specific message"""
     try:
-        conn = sqlite3.connect(DB_PATH)
+        conn = get_connection()
         cursor = conn.cursor()
         
         # Verify message exists
         cursor.execute("SELECT id FROM chat_history WHERE id = ?", (message_id,))
         if not cursor.fetchone():
-            conn.close()
             raise HTTPException(status_code=404, detail="Message not found")
         
         # Get vote counts
@@ -128,8 +127,6 @@ async def get_feedback_stats(message_id: int):
         up_votes, down_votes, total_votes = result or (0, 0, 0)
         net_score = up_votes - down_votes
         
-        conn.close()
-        
         return FeedbackStats(
             message_id=message_id,
             up_votes=up_votes,
@@ -150,7 +147,7 @@ async def get_user_feedback(
 ):
     """Get feedback for messages from a specific user"""
     try:
-        conn = sqlite3.connect(DB_PATH)
+        conn = get_connection()
         cursor = conn.cursor()
         
         cursor.execute("""
@@ -163,7 +160,6 @@ async def get_user_feedback(
         """, (user_id, limit))
         
         rows = cursor.fetchall()
-        conn.close()
         
         feedback_entries = []
         for row in rows:
@@ -190,14 +186,13 @@ async def get_user_feedback(
 async def delete_feedback(feedback_id: int):
     """Delete a specific feedback entry"""
     try:
-        conn = sqlite3.connect(DB_PATH)
+        conn = get_connection()
         cursor = conn.cursor()
         
         cursor.execute("DELETE FROM feedback WHERE id = ?", (feedback_id,))
         deleted_count = cursor.rowcount
         
         conn.commit()
-        conn.close()
         
         if deleted_count == 0:
             raise HTTPException(status_code=404, detail="Feedback not found")
@@ -216,7 +211,7 @@ async def delete_feedback(feedback_id: int):
 async def get_feedback_analytics():
     """Get overall feedback analytics"""
     try:
-        conn = sqlite3.connect(DB_PATH)
+        conn = get_connection()
         cursor = conn.cursor()
         
         # Overall stats
@@ -274,8 +269,6 @@ async def get_feedback_analytics():
                 "net_score": up_votes - down_votes
             })
         
-        conn.close()
-        
         return {
             "overall_stats": {
                 "total_feedback": total_feedback,
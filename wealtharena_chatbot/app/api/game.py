@@ -3,27 +3,57 @@ WealthArena Game API
 Game endpoints for trading simulation episodes
 """
 
-import json
+import os
+import asyncio
 import uuid
 import math
 import time
+import functools
 from datetime import datetime, date, timedelta
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Set
 from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import ORJSONResponse
 from pydantic import BaseModel
 import yfinance as yf
-import pandas as pd
+import numpy as np
+import orjson
 from ..metrics.prom import record_game_tick, record_game_trade
 
+# Optional Arrow IPC cache for episode history
+try:
+    import pyarrow as pa
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
 router = APIRouter()
 
 # In-memory state storage
 game_states: Dict[str, Dict[str, Any]] = {}
 active_games: Dict[str, Dict[str, Any]] = {}
-historical_data_cache: Dict[str, pd.DataFrame] = {}
+holdings_index: Dict[str, Dict[str, Dict[str, Any]]] = {}  # game_id -> symbol -> holding (same dicts as portfolio["holdings"])
+current_dates: Dict[str, tuple[str, date]] = {}  # game_id -> (current_date string, parsed date)
+# Keyed by episode_id, shared by all games: {symbol: {"dates", "close", "start", "lut"}} (see _to_price_arrays)
+episode_data_cache: Dict[str, Dict[str, Dict[str, Any]]] = {}
+_episode_locks: Dict[str, asyncio.Lock] = {}
+_episode_fetch_failures: Dict[str, float] = {}  # episode_id -> time.monotonic() of the last failed fetch
+EPISODE_FETCH_RETRY_INTERVAL = 60  # seconds to wait before refetching after a failure
 agent_states: Dict[str, Dict[str, Any]] = {}
 
+# Game states changed since the last flush to disk; the in-memory dicts are authoritative
+dirty_game_ids: Set[str] = set()
+GAME_STATE_FLUSH_INTERVAL = float(os.getenv("GAME_STATE_FLUSH_INTERVAL", "5"))
+_flush_task: Optional[asyncio.Task] = None
+
+# Transactions kept in the game state; older ones are only in the per-game log file
+RECENT_TRANSACTIONS_LIMIT = 50
+
+# On-disk cache of fetched episode history (survives restarts, memory-mapped by every worker)
+HIST_CACHE_DIR = Path("data/hist_cache")
+PRELOAD_EPISODES = os.getenv("GAME_PRELOAD_EPISODES", "true").lower() == "true"
+_preload_task: Optional[asyncio.Task] = None
+
 # Game episodes data
 EPISODES = [
     {
@@ -219,6 +249,32 @@ class AgentTrade(BaseModel):
     price: float
     reason: str
 
+@router.on_event("startup")
+async def _start_game_state_flusher():
+    """Start periodically persisting changed game states"""
+    global _flush_task
+    _flush_task = asyncio.create_task(_flush_game_states_loop())
+
+@router.on_event("startup")
+async def _start_episode_preload():
+    """Warm the episode cache in the background so the first tick doesn't pay for the fetch"""
+    global _preload_task
+    if PRELOAD_EPISODES:
+        _preload_task = asyncio.create_task(_preload_episode_data())
+
+@router.on_event("shutdown")
+async def _stop_episode_preload():
+    """Cancel the cache warm-up if it is still running"""
+    if _preload_task:
+        _preload_task.cancel()
+
+@router.on_event("shutdown")
+async def _stop_game_state_flusher():
+    """Stop the flusher and persist anything still pending"""
+    if _flush_task:
+        _flush_task.cancel()
+    await _flush_game_states()
+
 @router.get("/game/episodes", response_model=List[Episode])
 async def get_episodes():
     """Get available game episodes"""
@@ -277,7 +333,8 @@ async def start_game(request: GameStartRequest):
         "episode_id": episode["id"],  # Use the actual episode ID (not "random")
         "difficulty": request.difficulty,
         "portfolio": initial_portfolio,
-        "transactions": [],
+        "transactions": [],  # Most recent only; the full log is in {game_id}.txns.jsonl
+        "txn_count": 0,
         "created_at": datetime.now().isoformat(),
         "current_date": episode["start"],
         "status": "active"
@@ -286,6 +343,7 @@ async def start_game(request: GameStartRequest):
     # Store in memory
     game_states[game_id] = game_state
     active_games[game_id] = game_state
+    holdings_index[game_id] = {}
     
     # Persist to JSON file
     await _save_game_state(game_id, game_state)
@@ -331,13 +389,15 @@ async def get_portfolio(game_id: str = Query(...)):
     
     return {
         "cash": portfolio["cash"],
-        "holdings": [Holding(**holding) for holding in portfolio["holdings"]],
+        "holdings": [Holding.model_construct(**holding) for holding in portfolio["holdings"]],
         "equity": portfolio["equity"],
         "total_value": portfolio["total_value"],
         "pnl": total_pnl
     }
 
-@router.post("/game/tick", response_model=TickResponse)
+# /tick and /trade return ORJSONResponse directly, skipping response_model re-validation;
+# the models are still declared under responses= so the OpenAPI schema is unchanged
+@router.post("/game/tick", response_class=ORJSONResponse, responses={200: {"model": TickResponse}})
 async def tick_game(request: TickRequest):
     """Advance game time by N market days"""
     start_time = time.time()
@@ -346,18 +406,14 @@ async def tick_game(request: TickRequest):
     
     game_state = game_states[request.game_id]
     
-    # Get historical data if not cached
-    if request.game_id not in historical_data_cache:
-        await _load_historical_data(request.game_id, game_state)
+    # Get historical data (loaded once per episode)
+    historical_data = await _get_historical_data(game_state)
     
     # Advance date
-    current_date = datetime.strptime(game_state["current_date"], "%Y-%m-%d")
-    new_date = current_date + timedelta(days=request.speed)
-    game_state["current_date"] = new_date.strftime("%Y-%m-%d")
+    new_date = _get_current_date(request.game_id, game_state) + timedelta(days=request.speed)
+    _set_current_date(request.game_id, game_state, new_date)
     
     # Get new prices
-    historical_data = historical_data_cache[request.game_id]
-    prices = []
     price_updates = []
     
     # Get prices for all holdings
@@ -374,12 +430,12 @@ async def tick_game(request: TickRequest):
             holding["current_price"] = new_price
             holding["value"] = new_price * holding["shares"]
             
-            price_updates.append(PriceUpdate(
-                symbol=symbol,
-                price=new_price,
-                change=change,
-                change_percent=change_percent
-            ))
+            price_updates.append({
+                "symbol": symbol,
+                "price": new_price,
+                "change": change,
+                "change_percent": float(change_percent)
+            })
     
     # Recalculate portfolio
     total_holdings_value = sum(holding["value"] for holding in game_state["portfolio"]["holdings"])
@@ -390,28 +446,23 @@ async def tick_game(request: TickRequest):
     total_pnl = sum((holding["current_price"] - holding["avg_price"]) * holding["shares"] 
                    for holding in game_state["portfolio"]["holdings"])
     
-    # Save state
-    await _save_game_state(request.game_id, game_state)
+    # Persisted by the background flusher
+    _mark_game_dirty(request.game_id)
     
     # Record game tick metrics
     latency = time.time() - start_time
     record_game_tick(latency)
     
-    return TickResponse(
-        game_id=request.game_id,
-        current_date=game_state["current_date"],
-        prices=price_updates,
-        portfolio=Portfolio(
-            cash=game_state["portfolio"]["cash"],
-            holdings=[Holding(**holding) for holding in game_state["portfolio"]["holdings"]],
-            equity=game_state["portfolio"]["equity"],
-            total_value=game_state["portfolio"]["total_value"]
-        ),
-        pnl=total_pnl,
-        total_pnl=total_pnl
-    )
+    return ORJSONResponse({
+        "game_id": request.game_id,
+        "current_date": game_state["current_date"],
+        "prices": price_updates,
+        "portfolio": _portfolio_content(game_state["portfolio"]),
+        "pnl": float(total_pnl),
+        "total_pnl": float(total_pnl)
+    })
 
-@router.post("/game/trade", response_model=TradeResponse)
+@router.post("/game/trade", response_class=ORJSONResponse, responses={200: {"model": TradeResponse}})
 async def execute_trade(request: TradeRequest):
     """Execute a trade (buy/sell)"""
     if request.game_id not in game_states:
@@ -424,13 +475,13 @@ async def execute_trade(request: TradeRequest):
         raise HTTPException(status_code=400, detail="Type must be 'market' or 'limit'")
     
     game_state = game_states[request.game_id]
+    holdings_by_symbol = _get_holdings_index(request.game_id, game_state["portfolio"])
     
     # Get current price
-    if request.game_id not in historical_data_cache:
-        await _load_historical_data(request.game_id, game_state)
+    historical_data = await _get_historical_data(game_state)
     
-    current_date = datetime.strptime(game_state["current_date"], "%Y-%m-%d")
-    price = _get_price_for_date(historical_data_cache[request.game_id], request.symbol, current_date)
+    current_date = _get_current_date(request.game_id, game_state)
+    price = _get_price_for_date(historical_data, request.symbol, current_date)
     
     if price is None:
         raise HTTPException(status_code=400, detail=f"Price not available for {request.symbol} on {game_state['current_date']}")
@@ -456,7 +507,7 @@ async def execute_trade(request: TradeRequest):
             raise HTTPException(status_code=400, detail="Insufficient cash")
     else:  # sell
         # Check if we have enough shares
-        current_holding = next((h for h in game_state["portfolio"]["holdings"] if h["symbol"] == request.symbol), None)
+        current_holding = holdings_by_symbol.get(request.symbol)
         if not current_holding or current_holding["shares"] < request.qty:
             raise HTTPException(status_code=400, detail="Insufficient shares")
     
@@ -465,7 +516,7 @@ async def execute_trade(request: TradeRequest):
         game_state["portfolio"]["cash"] -= total_with_fees
         
         # Add or update holding
-        existing_holding = next((h for h in game_state["portfolio"]["holdings"] if h["symbol"] == request.symbol), None)
+        existing_holding = holdings_by_symbol.get(request.symbol)
         if existing_holding:
             # Update existing holding
             total_shares = existing_holding["shares"] + request.qty
@@ -484,15 +535,17 @@ async def execute_trade(request: TradeRequest):
                 "value": total_cost
             }
             game_state["portfolio"]["holdings"].append(new_holding)
+            holdings_by_symbol[request.symbol] = new_holding
     else:  # sell
         game_state["portfolio"]["cash"] += total_cost - fees
         
         # Update or remove holding
-        existing_holding = next((h for h in game_state["portfolio"]["holdings"] if h["symbol"] == request.symbol), None)
+        existing_holding = holdings_by_symbol.get(request.symbol)
         if existing_holding:
             existing_holding["shares"] -= request.qty
             if existing_holding["shares"] <= 0:
                 game_state["portfolio"]["holdings"].remove(existing_holding)
+                del holdings_by_symbol[request.symbol]
             else:
                 existing_holding["current_price"] = price
                 existing_holding["value"] = price * existing_holding["shares"]
@@ -516,29 +569,29 @@ async def execute_trade(request: TradeRequest):
         "total_cost": total_cost,
         "fees": fees
     }
+    await _append_transaction(request.game_id, transaction)
+    game_state["txn_count"] = game_state.get("txn_count", len(game_state["transactions"])) + 1
+    
+    # Keep only the latest few in the state snapshot
     game_state["transactions"].append(transaction)
+    del game_state["transactions"][:-RECENT_TRANSACTIONS_LIMIT]
     
-    # Save state
-    await _save_game_state(request.game_id, game_state)
+    # Persisted by the background flusher
+    _mark_game_dirty(request.game_id)
     
     # Record trade metrics
     record_game_trade(request.side)
     
-    return TradeResponse(
-        game_id=request.game_id,
-        symbol=request.symbol,
-        side=request.side,
-        qty=request.qty,
-        price=price,
-        total_cost=total_cost,
-        portfolio=Portfolio(
-            cash=game_state["portfolio"]["cash"],
-            holdings=[Holding(**holding) for holding in game_state["portfolio"]["holdings"]],
-            equity=game_state["portfolio"]["equity"],
-            total_value=game_state["portfolio"]["total_value"]
-        ),
-        pnl=total_pnl
-    )
+    return ORJSONResponse({
+        "game_id": request.game_id,
+        "symbol": request.symbol,
+        "side": request.side,
+        "qty": request.qty,
+        "price": float(price),
+        "total_cost": float(total_cost),
+        "portfolio": _portfolio_content(game_state["portfolio"]),
+        "pnl": float(total_pnl)
+    })
 
 @router.get("/game/summary", response_model=GameSummary)
 async def get_game_summary(game_id: str = Query(...)):
@@ -560,10 +613,10 @@ async def get_game_summary(game_id: str = Query(...)):
     return_pct = ((current_value - initial_cash) / initial_cash) * 100
     
     # Get trades count
-    trades_count = len(game_state["transactions"])
+    trades_count = game_state.get("txn_count", len(game_state["transactions"]))
     
     # Calculate Sharpe ratio and max drawdown from equity curve
-    sharpe_est, max_drawdown = _calculate_performance_metrics(game_state, episode)
+    sharpe_est, max_drawdown = _calculate_performance_metrics(episode)
     
     # Calculate composite score
     score = _calculate_score(return_pct, sharpe_est, max_drawdown, trades_count)
@@ -590,50 +643,38 @@ async def get_benchmark_data(game_id: str = Query(...)):
     if not episode:
         raise HTTPException(status_code=404, detail="Episode not found")
     
-    # Load historical data if not cached
-    if game_id not in historical_data_cache:
-        await _load_historical_data(game_id, game_state)
-    
-    # Get SPY data from cache
-    historical_data = historical_data_cache[game_id]
+    # Get SPY data from the episode cache
+    historical_data = await _get_historical_data(game_state)
     if "SPY" not in historical_data:
         raise HTTPException(status_code=404, detail="SPY benchmark data not available for this game period")
     
     spy_data = historical_data["SPY"]
     
-    # Filter data to game episode dates
-    start_date = datetime.strptime(episode["start"], "%Y-%m-%d")
-    end_date = datetime.strptime(episode["end"], "%Y-%m-%d")
-    
     # Filter data to episode date range
-    episode_data = spy_data[(spy_data.index.date >= start_date.date()) & 
-                           (spy_data.index.date <= end_date.date())]
+    lo, hi = _episode_window(spy_data["dates"], episode)
+    dates = spy_data["dates"][lo:hi]
+    closes = spy_data["close"][lo:hi]
     
-    if len(episode_data) == 0:
+    if len(dates) == 0:
         raise HTTPException(status_code=404, detail="No benchmark data available for the game episode period")
     
-    # Convert to benchmark data points
-    benchmark_data = []
-    prev_price = None
+    # Day-over-day changes (the first day has no previous close, so it is compared to itself)
+    prev_closes = np.concatenate((closes[:1], closes[:-1]))
+    changes = closes - prev_closes
+    change_percents = (changes / prev_closes) * 100
     
-    for date_idx, row in episode_data.iterrows():
-        current_price = float(row["Close"])
-        
-        if prev_price is not None:
-            change = current_price - prev_price
-            change_percent = (change / prev_price) * 100
-        else:
-            change = 0.0
-            change_percent = 0.0
-        
-        benchmark_data.append(BenchmarkData(
-            date=date_idx.strftime("%Y-%m-%d"),
-            price=current_price,
+    # Convert to benchmark data points
+    benchmark_data = [
+        BenchmarkData(
+            date=date_str,
+            price=price,
             change=round(change, 2),
             change_percent=round(change_percent, 2)
-        ))
-        
-        prev_price = current_price
+        )
+        for date_str, price, change, change_percent in zip(
+            np.datetime_as_string(dates).tolist(), closes.tolist(), changes.tolist(), change_percents.tolist()
+        )
+    ]
     
     return BenchmarkResponse(
         game_id=game_id,
@@ -699,14 +740,12 @@ async def agent_tick(request: AgentTickRequest):
     game_state = game_states[game_id]
     
     # Load historical data if not cached
-    if game_id not in historical_data_cache:
-        await _load_historical_data(game_id, game_state)
+    historical_data = await _get_historical_data(game_state)
     
     # Get current date from game
-    current_date = datetime.strptime(game_state["current_date"], "%Y-%m-%d")
+    current_date = _get_current_date(game_id, game_state)
     
     # Get SPY data
-    historical_data = historical_data_cache[game_id]
     if "SPY" not in historical_data:
         raise HTTPException(status_code=404, detail="SPY data not available")
     
@@ -715,7 +754,7 @@ async def agent_tick(request: AgentTickRequest):
     # Get current SPY price
     current_price = _get_price_for_date(historical_data, "SPY", current_date)
     if current_price is None:
-        raise HTTPException(status_code=400, detail=f"SPY price not available for {current_date.strftime('%Y-%m-%d')}")
+        raise HTTPException(status_code=400, detail=f"SPY price not available for {game_state['current_date']}")
     
     # Calculate SMA10
     sma10 = _calculate_sma(spy_data, current_date, 10)
@@ -765,7 +804,7 @@ async def agent_tick(request: AgentTickRequest):
             trade = {
                 "trade_id": str(uuid.uuid4()),
                 "agent_id": request.agent_id,
-                "date": current_date.strftime("%Y-%m-%d"),
+                "date": game_state["current_date"],
                 "action": "BUY",
                 "symbol": "SPY",
                 "quantity": shares_to_buy,
@@ -788,7 +827,7 @@ async def agent_tick(request: AgentTickRequest):
             trade = {
                 "trade_id": str(uuid.uuid4()),
                 "agent_id": request.agent_id,
-                "date": current_date.strftime("%Y-%m-%d"),
+                "date": game_state["current_date"],
                 "action": "SELL",
                 "symbol": "SPY",
                 "quantity": shares_to_sell,
@@ -804,7 +843,7 @@ async def agent_tick(request: AgentTickRequest):
     agent_state["portfolio"]["total_value"] = agent_state["portfolio"]["equity"]
     
     # Update current date
-    agent_state["current_date"] = current_date.strftime("%Y-%m-%d")
+    agent_state["current_date"] = game_state["current_date"]
     
     # Save agent state
     await _save_agent_state(request.agent_id, agent_state)
@@ -816,9 +855,9 @@ async def agent_tick(request: AgentTickRequest):
         reason=reason,
         sma10=round(sma10, 2),
         current_price=round(current_price, 2),
-        portfolio=Portfolio(
+        portfolio=Portfolio.model_construct(
             cash=agent_state["portfolio"]["cash"],
-            holdings=[Holding(**holding) for holding in agent_state["portfolio"]["holdings"]],
+            holdings=[Holding.model_construct(**holding) for holding in agent_state["portfolio"]["holdings"]],
             equity=agent_state["portfolio"]["equity"],
             total_value=agent_state["portfolio"]["total_value"]
         )
@@ -845,9 +884,9 @@ async def get_agent_portfolio(agent_id: str = Query(...)):
     
     return AgentPortfolioResponse(
         agent_id=agent_id,
-        portfolio=Portfolio(
+        portfolio=Portfolio.model_construct(
             cash=agent_state["portfolio"]["cash"],
-            holdings=[Holding(**holding) for holding in agent_state["portfolio"]["holdings"]],
+            holdings=[Holding.model_construct(**holding) for holding in agent_state["portfolio"]["holdings"]],
             equity=agent_state["portfolio"]["equity"],
             total_value=agent_state["portfolio"]["total_value"]
         ),
@@ -865,35 +904,50 @@ async def get_agent_trades(agent_id: str = Query(...)):
     
     return [AgentTrade(**trade) for trade in agent_state["trades"]]
 
-def _calculate_sma(data: pd.DataFrame, target_date: datetime, period: int) -> Optional[float]:
+def _portfolio_content(portfolio: Dict[str, Any]) -> Dict[str, Any]:
+    """Portfolio as a plain dict matching the Portfolio schema, for ORJSONResponse bodies"""
+    return {
+        "cash": float(portfolio["cash"]),
+        "holdings": portfolio["holdings"],
+        "equity": float(portfolio["equity"]),
+        "total_value": float(portfolio["total_value"])
+    }
+
+def _get_holdings_index(game_id: str, portfolio: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Get the symbol -> holding index for a game, building it from the holdings list if missing"""
+    index = holdings_index.get(game_id)
+    if index is None:
+        index = {holding["symbol"]: holding for holding in portfolio["holdings"]}
+        holdings_index[game_id] = index
+    return index
+
+def _get_current_date(game_id: str, game_state: Dict[str, Any]) -> date:
+    """Get a game's current date, only re-parsing the stored string when it has changed"""
+    cached = current_dates.get(game_id)
+    if cached is not None and cached[0] == game_state["current_date"]:
+        return cached[1]
+    
+    current_date = date.fromisoformat(game_state["current_date"])
+    current_dates[game_id] = (game_state["current_date"], current_date)
+    return current_date
+
+def _set_current_date(game_id: str, game_state: Dict[str, Any], new_date: date) -> None:
+    """Set a game's current date, keeping the parsed copy in sync"""
+    game_state["current_date"] = new_date.isoformat()
+    current_dates[game_id] = (game_state["current_date"], new_date)
+
+def _calculate_sma(data: Dict[str, Any], target_date: date, period: int) -> Optional[float]:
     """Calculate Simple Moving Average for a given period"""
     try:
-        # Get data up to and including the target date
-        target_date_str = target_date.strftime("%Y-%m-%d")
-        available_dates = [d.strftime("%Y-%m-%d") for d in data.index]
-        
-        # Find the target date or the closest previous date
-        if target_date_str in available_dates:
-            end_date = target_date_str
-        else:
-            # Find the closest previous date
-            previous_dates = [d for d in available_dates if d <= target_date_str]
-            if not previous_dates:
-                return None
-            end_date = max(previous_dates)
-        
-        # Get the index of the end date
-        end_idx = available_dates.index(end_date)
+        # Number of data points up to and including the target date
+        end = int(np.searchsorted(data["dates"], np.datetime64(target_date), side="right"))
         
         # Need at least 'period' data points
-        if end_idx < period - 1:
+        if end < period:
             return None
         
         # Calculate SMA for the last 'period' days
-        start_idx = end_idx - period + 1
-        sma_data = data.iloc[start_idx:end_idx + 1]["Close"]
-        
-        return float(sma_data.mean())
+        return float(data["close"][end - period:end].mean())
         
     except Exception as e:
         print(f"Warning: Failed to calculate SMA: {e}")
@@ -907,8 +961,9 @@ async def _save_agent_state(agent_id: str, agent_state: Dict[str, Any]) -> None:
         
         file_path = data_dir / f"agent_{agent_id}.json"
         
-        with open(file_path, 'w') as f:
-            json.dump(agent_state, f, indent=2, default=str)
+        # Serialize here so the snapshot is consistent, then write off the event loop
+        payload = orjson.dumps(agent_state, default=str, option=orjson.OPT_NON_STR_KEYS)
+        await asyncio.to_thread(_write_file_atomic, file_path, payload)
             
     except Exception as e:
         # Log error but don't fail the request
@@ -923,94 +978,82 @@ async def _load_agent_state(agent_id: str) -> Optional[Dict[str, Any]]:
         if not file_path.exists():
             return None
             
-        with open(file_path, 'r') as f:
-            return json.load(f)
+        with open(file_path, 'rb') as f:
+            return orjson.loads(f.read())
             
     except Exception as e:
         print(f"Warning: Failed to load agent state for {agent_id}: {e}")
         return None
 
-def _calculate_performance_metrics(game_state: Dict[str, Any], episode: Dict[str, Any]) -> tuple[float, float]:
+def _calculate_performance_metrics(episode: Dict[str, Any]) -> tuple[float, float]:
     """Calculate Sharpe ratio and max drawdown from equity curve"""
+    # Not loaded yet: don't let the memoized result pin (0, 0) for the episode
+    if not episode_data_cache.get(episode["id"]):
+        return 0.0, 0.0
+    
     try:
-        # Get historical data for equity curve simulation
-        if game_state["game_id"] not in historical_data_cache:
-            return 0.0, 0.0
-        
-        historical_data = historical_data_cache[game_state["game_id"]]
-        
-        # Create equity curve by simulating portfolio value over time
-        start_date = datetime.strptime(episode["start"], "%Y-%m-%d")
-        end_date = datetime.strptime(episode["end"], "%Y-%m-%d")
-        
-        # Get a reference symbol for daily returns (use SPY if available)
-        reference_symbol = "SPY"
-        if reference_symbol not in historical_data:
-            # Use first available symbol
-            if not historical_data:
-                return 0.0, 0.0
-            reference_symbol = list(historical_data.keys())[0]
-        
-        ref_data = historical_data[reference_symbol]
-        
-        # Calculate daily returns from reference data
-        daily_returns = []
-        equity_values = []
-        initial_cash = DIFFICULTY_LEVELS[game_state["difficulty"]]["starting_cash"]
-        
-        # Simulate portfolio value changes based on market movements
-        current_date = start_date
-        prev_price = None
-        
-        for date_idx in ref_data.index:
-            if date_idx.date() < start_date.date() or date_idx.date() > end_date.date():
-                continue
-                
-            current_price = float(ref_data.loc[date_idx, "Close"])
-            
-            if prev_price is not None:
-                daily_return = (current_price - prev_price) / prev_price
-                daily_returns.append(daily_return)
-                
-                # Simulate portfolio value change (simplified)
-                portfolio_return = daily_return * 0.8  # Assume 80% correlation with market
-                new_value = equity_values[-1] * (1 + portfolio_return) if equity_values else initial_cash
-                equity_values.append(new_value)
-            else:
-                equity_values.append(initial_cash)
-            
-            prev_price = current_price
-        
-        if len(daily_returns) < 2:
-            return 0.0, 0.0
-        
-        # Calculate Sharpe ratio: (mean return / std return) * sqrt(252)
-        mean_return = sum(daily_returns) / len(daily_returns)
-        std_return = math.sqrt(sum((r - mean_return) ** 2 for r in daily_returns) / len(daily_returns))
-        
-        if std_return == 0:
-            sharpe_ratio = 0.0
-        else:
-            sharpe_ratio = (mean_return / std_return) * math.sqrt(252)
-        
-        # Calculate max drawdown from equity curve
-        max_drawdown = 0.0
-        peak = equity_values[0]
-        
-        for value in equity_values:
-            if value > peak:
-                peak = value
-            drawdown = (peak - value) / peak
-            max_drawdown = max(max_drawdown, drawdown)
-        
-        max_drawdown *= 100  # Convert to percentage
-        
-        return sharpe_ratio, max_drawdown
-        
+        return _episode_sharpe_dd(episode["id"])
     except Exception as e:
+        # Handled outside the cache so a failure isn't memoized for the episode
         print(f"Error calculating performance metrics: {e}")
         return 0.0, 0.0
 
+@functools.lru_cache(maxsize=16)
+def _episode_sharpe_dd(episode_id: str) -> tuple[float, float]:
+    """Sharpe ratio and max drawdown of the simulated equity curve for an episode.
+    
+    Both are scale-invariant, so they don't depend on the game's starting cash and
+    can be computed once per episode from its immutable price history.
+    """
+    # Get historical data for equity curve simulation
+    historical_data = episode_data_cache.get(episode_id)
+    if not historical_data:
+        return 0.0, 0.0
+    
+    episode = next(ep for ep in EPISODES if ep["id"] == episode_id)
+    
+    # Create equity curve by simulating portfolio value over time
+    # Get a reference symbol for daily returns (use SPY if available)
+    reference_symbol = "SPY"
+    if reference_symbol not in historical_data:
+        # Use first available symbol
+        if not historical_data:
+            return 0.0, 0.0
+        reference_symbol = list(historical_data.keys())[0]
+    
+    ref_data = historical_data[reference_symbol]
+    lo, hi = _episode_window(ref_data["dates"], episode)
+    
+    close = ref_data["close"][lo:hi]
+    initial_cash = 1.0
+    
+    # Calculate daily returns from reference data
+    daily_returns = np.diff(close) / close[:-1]
+    
+    if len(daily_returns) < 2:
+        return 0.0, 0.0
+    
+    # Simulate portfolio value changes based on market movements
+    # (simplified: assume 80% correlation with market)
+    equity_values = initial_cash * np.concatenate(([1.0], np.cumprod(1 + daily_returns * 0.8)))
+    
+    # Calculate Sharpe ratio: (mean return / std return) * sqrt(252)
+    mean_return = daily_returns.mean()
+    std_return = daily_returns.std()
+    
+    if std_return == 0:
+        sharpe_ratio = 0.0
+    else:
+        sharpe_ratio = float(mean_return / std_return) * math.sqrt(252)
+    
+    # Calculate max drawdown from equity curve
+    peaks = np.maximum.accumulate(equity_values)
+    max_drawdown = float(((peaks - equity_values) / peaks).max())
+    
+    max_drawdown *= 100  # Convert to percentage
+    
+    return sharpe_ratio, max_drawdown
+
 def _calculate_score(return_pct: float, sharpe_est: float, max_drawdown: float, trades_count: int) -> float:
     """Calculate composite performance score"""
     # Base score from return percentage (0-100 scale)
@@ -1040,13 +1083,56 @@ async def _save_game_state(game_id: str, game_state: Dict[str, Any]) -> None:
         
         file_path = data_dir / f"{game_id}.json"
         
-        with open(file_path, 'w') as f:
-            json.dump(game_state, f, indent=2, default=str)
+        # Serialize here so the snapshot is consistent, then write off the event loop
+        payload = orjson.dumps(game_state, default=str, option=orjson.OPT_NON_STR_KEYS)
+        await asyncio.to_thread(_write_file_atomic, file_path, payload)
             
     except Exception as e:
         # Log error but don't fail the request
         print(f"Warning: Failed to save game state for {game_id}: {e}")
 
+def _mark_game_dirty(game_id: str) -> None:
+    """Queue a game state to be written on the next flush"""
+    dirty_game_ids.add(game_id)
+
+async def _flush_game_states() -> None:
+    """Save every game state changed since the last flush"""
+    while dirty_game_ids:
+        game_id = dirty_game_ids.pop()
+        if game_id in game_states:
+            await _save_game_state(game_id, game_states[game_id])
+
+async def _flush_game_states_loop() -> None:
+    """Flush changed game states every GAME_STATE_FLUSH_INTERVAL seconds"""
+    while True:
+        await asyncio.sleep(GAME_STATE_FLUSH_INTERVAL)
+        await _flush_game_states()
+
+async def _append_transaction(game_id: str, transaction: Dict[str, Any]) -> None:
+    """Append a transaction to the game's JSONL log"""
+    try:
+        data_dir = Path("data/game_state")
+        data_dir.mkdir(parents=True, exist_ok=True)
+        
+        file_path = data_dir / f"{game_id}.txns.jsonl"
+        line = orjson.dumps(transaction, default=str) + b"\n"
+        await asyncio.to_thread(_append_bytes, file_path, line)
+        
+    except Exception as e:
+        # Log error but don't fail the request
+        print(f"Warning: Failed to log transaction for {game_id}: {e}")
+
+def _append_bytes(file_path: Path, payload: bytes) -> None:
+    """Append bytes to a file"""
+    with open(file_path, 'ab') as f:
+        f.write(payload)
+
+def _write_file_atomic(file_path: Path, payload: bytes) -> None:
+    """Write to a temp file and rename it over the target so readers never see a partial file"""
+    tmp_path = file_path.with_name(f"{file_path.name}.{uuid.uuid4().hex}.tmp")
+    tmp_path.write_bytes(payload)
+    os.replace(tmp_path, file_path)
+
 async def _load_game_state(game_id: str) -> Optional[Dict[str, Any]]:
     """Load game state from JSON file"""
     try:
@@ -1056,71 +1142,203 @@ async def _load_game_state(game_id: str) -> Optional[Dict[str, Any]]:
         if not file_path.exists():
             return None
             
-        with open(file_path, 'r') as f:
-            return json.load(f)
+        with open(file_path, 'rb') as f:
+            return orjson.loads(f.read())
             
     except Exception as e:
         print(f"Warning: Failed to load game state for {game_id}: {e}")
         return None
 
+async def _get_historical_data(game_state: Dict[str, Any]) -> Dict[str, Dict[str, Any]]:
+    """Get the shared historical data for a game's episode, loading it on first use"""
+    episode_id = game_state["episode_id"]
+    if episode_id not in episode_data_cache:
+        await _load_episode_data(episode_id)
+    return episode_data_cache.get(episode_id, {})
+
 async def _load_historical_data(game_id: str, game_state: Dict[str, Any]) -> None:
     """Load historical data for the game episode"""
-    try:
-        episode_id = game_state["episode_id"]
-        episode = next((ep for ep in EPISODES if ep["id"] == episode_id), None)
-        
-        if not episode:
-            raise ValueError(f"Episode {episode_id} not found")
-        
-        start_date = episode["start"]
-        end_date = episode["end"]
+    await _load_episode_data(game_state["episode_id"])
+
+async def _preload_episode_data() -> None:
+    """Load every episode into the cache"""
+    for episode in EPISODES:
+        await _load_episode_data(episode["id"])
+
+async def _load_episode_data(episode_id: str) -> None:
+    """Load historical data for an episode into the shared cache"""
+    # Episode windows are fixed, so one fetch serves every game on the episode.
+    # The lock keeps concurrent first requests from all hitting Yahoo at once.
+    lock = _episode_locks.setdefault(episode_id, asyncio.Lock())
+    async with lock:
+        if episode_id in episode_data_cache:
+            return
         
-        # Common symbols to fetch
-        symbols = ["SPY", "QQQ", "AAPL", "MSFT", "GOOGL", "AMZN", "TSLA", "NVDA", "META", "NFLX"]
+        # Yahoo failed recently: don't make every request wait on it again
+        failed_at = _episode_fetch_failures.get(episode_id)
+        if failed_at is not None and time.monotonic() - failed_at < EPISODE_FETCH_RETRY_INTERVAL:
+            return
         
-        # Fetch data for all symbols
-        all_data = {}
-        for symbol in symbols:
+        try:
+            episode = next((ep for ep in EPISODES if ep["id"] == episode_id), None)
+            
+            if not episode:
+                raise ValueError(f"Episode {episode_id} not found")
+            
+            # Common symbols to fetch
+            symbols = ["SPY", "QQQ", "AAPL", "MSFT", "GOOGL", "AMZN", "TSLA", "NVDA", "META", "NFLX"]
+            
+            # Episode history is immutable, so reuse whatever a previous run fetched
+            # (ignoring files written from a partial fetch by older versions)
+            cached = await asyncio.to_thread(_read_episode_cache, episode_id)
+            if cached and cached.keys() >= set(symbols):
+                episode_data_cache[episode_id] = {
+                    symbol: _to_price_arrays(dates, close, episode) for symbol, (dates, close) in cached.items()
+                }
+                return
+            
+            start_date = episode["start"]
+            end_date = episode["end"]
+            
+            # Fetch all symbols in one threaded request instead of one round trip per ticker
+            all_data = {}
             try:
-                ticker = yf.Ticker(symbol)
-                hist = ticker.history(start=start_date, end=end_date)
-                if not hist.empty:
-                    all_data[symbol] = hist
+                data = await asyncio.to_thread(
+                    yf.download,
+                    symbols,
+                    start=start_date,
+                    end=end_date,
+                    group_by="ticker",
+                    threads=True,
+                    auto_adjust=True,
+                    progress=False
+                )
+                fetched = set(data.columns.get_level_values(0))
+                for symbol in symbols:
+                    if symbol not in fetched:
+                        continue
+                    hist = data[symbol].dropna(how="all")
+                    if not hist.empty:
+                        all_data[symbol] = hist
             except Exception as e:
-                print(f"Warning: Failed to fetch data for {symbol}: {e}")
+                print(f"Warning: Failed to fetch data for {', '.join(symbols)}: {e}")
+            
+            # Only cache successful fetches so a transient failure is retried (after a backoff)
+            if all_data:
+                _episode_fetch_failures.pop(episode_id, None)
+                episode_data_cache[episode_id] = {
+                    symbol: _to_price_arrays(
+                        hist.index.values.astype("datetime64[D]"),
+                        hist["Close"].to_numpy(dtype=np.float64),
+                        episode
+                    )
+                    for symbol, hist in all_data.items()
+                }
+                # Partial fetches stay in memory only, so the next start tries the missing symbols again
+                if len(all_data) == len(symbols):
+                    await asyncio.to_thread(_write_episode_cache, episode_id, episode_data_cache[episode_id])
+            else:
+                _episode_fetch_failures[episode_id] = time.monotonic()
+            
+        except Exception as e:
+            print(f"Warning: Failed to load historical data for {episode_id}: {e}")
+
+def _to_price_arrays(dates: np.ndarray, close: np.ndarray, episode: Dict[str, Any]) -> Dict[str, Any]:
+    """Bundle a symbol's sorted date and close arrays for the episode cache.
+    
+    Also builds a lookup table mapping each calendar day of the episode (as an
+    offset from its start) to the row of the first trading day on or after it,
+    so in-episode price lookups are a single array index.
+    """
+    start = date.fromisoformat(episode["start"])
+    days = np.arange(np.datetime64(episode["start"]), np.datetime64(episode["end"]) + 1)
+    
+    return {
+        "dates": dates,
+        "close": close,
+        "start": start,
+        "lut": np.searchsorted(dates, days).astype(np.int32)
+    }
+
+def _episode_window(dates: np.ndarray, episode: Dict[str, Any]) -> tuple[int, int]:
+    """Get the [lo, hi) slice of a sorted date array covering the episode"""
+    start, end = np.datetime64(episode["start"]), np.datetime64(episode["end"])
+    return int(np.searchsorted(dates, start, side="left")), int(np.searchsorted(dates, end, side="right"))
+
+def _read_episode_cache(episode_id: str) -> Optional[Dict[str, tuple[np.ndarray, np.ndarray]]]:
+    """Read an episode's history from the Arrow cache as (dates, close) arrays per symbol"""
+    file_path = HIST_CACHE_DIR / f"{episode_id}.arrow"
+    if not PYARROW_AVAILABLE or not file_path.exists():
+        return None
+    
+    try:
+        # Memory-map the file so the arrays are zero-copy views of the page cache,
+        # shared by every worker process that reads the same episode
+        table = pa.ipc.open_file(pa.memory_map(str(file_path), "r")).read_all().combine_chunks()
+        if table.num_rows == 0:
+            return None
+        
+        days = table.column("day").chunk(0).to_numpy().view("datetime64[D]")
+        close = table.column("close").chunk(0).to_numpy()
         
-        # Store in cache
-        historical_data_cache[game_id] = all_data
+        # Rows are grouped by symbol; split them into per-symbol slices
+        symbols = np.asarray(table.column("symbol").to_pylist())
+        bounds = np.concatenate(([0], np.flatnonzero(symbols[1:] != symbols[:-1]) + 1, [len(symbols)]))
+        return {
+            str(symbols[lo]): (days[lo:hi], close[lo:hi])
+            for lo, hi in zip(bounds[:-1].tolist(), bounds[1:].tolist())
+        }
+    except Exception as e:
+        print(f"Warning: Failed to read history cache for {episode_id}: {e}")
+        return None
+
+def _write_episode_cache(episode_id: str, episode_data: Dict[str, Dict[str, Any]]) -> None:
+    """Write an episode's history to the Arrow cache"""
+    if not PYARROW_AVAILABLE:
+        return
+    
+    try:
+        HIST_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        file_path = HIST_CACHE_DIR / f"{episode_id}.arrow"
+        # Unique temp name per writer: every worker's preload may write the same episode on a cold start
+        tmp_path = file_path.with_name(f"{file_path.name}.{uuid.uuid4().hex}.tmp")
+        
+        # Long-form table grouped by symbol; dates as int64 days so they map straight to datetime64[D].
+        # Left uncompressed so readers can memory-map it without decoding.
+        table = pa.table({
+            "symbol": [symbol for symbol, prices in episode_data.items() for _ in range(len(prices["dates"]))],
+            "day": np.concatenate([prices["dates"] for prices in episode_data.values()]).astype(np.int64),
+            "close": np.concatenate([prices["close"] for prices in episode_data.values()])
+        })
+        with pa.OSFile(str(tmp_path), "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, file_path)
         
     except Exception as e:
-        print(f"Warning: Failed to load historical data for {game_id}: {e}")
-        historical_data_cache[game_id] = {}
+        # Cache is best-effort; the data is already in memory
+        print(f"Warning: Failed to write history cache for {episode_id}: {e}")
 
-def _get_price_for_date(historical_data: Dict[str, pd.DataFrame], symbol: str, target_date: datetime) -> Optional[float]:
+def _get_price_for_date(historical_data: Dict[str, Dict[str, Any]], symbol: str, target_date: date) -> Optional[float]:
     """Get price for a specific symbol and date"""
     try:
         if symbol not in historical_data:
             return None
         
-        data = historical_data[symbol]
-        target_date_str = target_date.strftime("%Y-%m-%d")
+        prices = historical_data[symbol]
         
-        # Find the closest date (forward fill)
-        available_dates = [d.strftime("%Y-%m-%d") for d in data.index]
-        
-        # Find exact match or next available date
-        if target_date_str in available_dates:
-            price_date = target_date_str
+        # Exact date or the next available one (forward fill): precomputed inside
+        # the episode, binary search of the sorted dates otherwise
+        offset = (target_date - prices["start"]).days
+        if 0 <= offset < len(prices["lut"]):
+            i = prices["lut"][offset]
         else:
-            # Find next available date
-            future_dates = [d for d in available_dates if d >= target_date_str]
-            if not future_dates:
-                return None
-            price_date = min(future_dates)
+            i = np.searchsorted(prices["dates"], np.datetime64(target_date))
+        if i == len(prices["dates"]):
+            return None
         
         # Get the price (use Close price)
-        price = data.loc[price_date, "Close"]
-        return float(price)
+        return float(prices["close"][i])
         
     except Exception as e:
         print(f"Warning: Failed to get price for {symbol} on {target_date}: {e}")
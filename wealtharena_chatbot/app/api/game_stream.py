@@ -5,14 +5,12 @@ Real-time game streaming with play/pause/rewind controls
 
 import json
 import asyncio
-from datetime import datetime, timedelta
-from typing import Dict, Any, Optional
-from fastapi import APIRouter, WebSocket, WebSocketDisconnect, HTTPException
+from datetime import timedelta
+from typing import Dict, Optional
+from fastapi import APIRouter, WebSocket, WebSocketDisconnect
 from pydantic import BaseModel
-import yfinance as yf
-import pandas as pd
 
-from .game import game_states, historical_data_cache, _load_historical_data, _get_price_for_date, _save_game_state, DIFFICULTY_LEVELS
+from .game import game_states, episode_data_cache, _load_historical_data, _get_price_for_date, _get_current_date, _set_current_date, _mark_game_dirty
 
 router = APIRouter()
 
@@ -89,14 +87,14 @@ class GameStreamManager:
             game_state = game_states[self.game_id]
             
             # Get current prices for all symbols
-            current_date = datetime.strptime(game_state["current_date"], "%Y-%m-%d")
+            current_date = _get_current_date(self.game_id, game_state)
             prices = {}
             
             # Get prices for common symbols
             symbols = ["SPY", "QQQ", "AAPL", "MSFT", "GOOGL", "AMZN", "TSLA", "NVDA", "META", "NFLX"]
             
-            if self.game_id in historical_data_cache:
-                historical_data = historical_data_cache[self.game_id]
+            historical_data = episode_data_cache.get(game_state["episode_id"])
+            if historical_data:
                 for symbol in symbols:
                     price = _get_price_for_date(historical_data, symbol, current_date)
                     if price is not None:
@@ -140,13 +138,12 @@ class GameStreamManager:
                 return
                 
             game_state = game_states[self.game_id]
-            current_date = datetime.strptime(game_state["current_date"], "%Y-%m-%d")
-            new_date = current_date - timedelta(days=command.days or 1)
-            game_state["current_date"] = new_date.strftime("%Y-%m-%d")
+            new_date = _get_current_date(self.game_id, game_state) - timedelta(days=command.days or 1)
+            _set_current_date(self.game_id, game_state, new_date)
             
             # Update portfolio prices
-            if self.game_id in historical_data_cache:
-                historical_data = historical_data_cache[self.game_id]
+            historical_data = episode_data_cache.get(game_state["episode_id"])
+            if historical_data:
                 for holding in game_state["portfolio"]["holdings"]:
                     new_price = _get_price_for_date(historical_data, holding["symbol"], new_date)
                     if new_price is not None:
@@ -158,8 +155,8 @@ class GameStreamManager:
                 game_state["portfolio"]["equity"] = game_state["portfolio"]["cash"] + total_holdings_value
                 game_state["portfolio"]["total_value"] = game_state["portfolio"]["equity"]
             
-            # Save state
-            await _save_game_state(self.game_id, game_state)
+            # Persisted by the background flusher
+            _mark_game_dirty(self.game_id)
             
             await self.websocket.send_json({
                 "status": "rewound", 
@@ -185,7 +182,7 @@ async def websocket_endpoint(websocket: WebSocket):
             return
         
         # Load historical data if not cached
-        if game_id not in historical_data_cache:
+        if game_states[game_id]["episode_id"] not in episode_data_cache:
             await _load_historical_data(game_id, game_states[game_id])
         
         # Create stream manager
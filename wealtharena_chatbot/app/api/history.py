@@ -9,13 +9,16 @@ from datetime import datetime
 from typing import List, Optional, Dict, Any
 from fastapi import APIRouter, HTTPException, Query
 from pydantic import BaseModel
-import json
+import orjson
 
 router = APIRouter()
 
 # Database file path
 DB_PATH = "data/chat_history.db"
 
+# Process-wide connection shared by all chat history endpoints
+_conn: Optional[sqlite3.Connection] = None
+
 class ChatHistoryRequest(BaseModel):
     user_id: str
     message: str
@@ -66,13 +69,29 @@ def init_database():
     """)
     
     # Create indexes for better performance
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_chat_history_user_id ON chat_history(user_id)")
+    # (user_id, created_at) serves both the per-user filter and the ORDER BY created_at,
+    # so it supersedes the old single-column user_id index
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_chat_history_user_created ON chat_history(user_id, created_at DESC)")
+    cursor.execute("DROP INDEX IF EXISTS idx_chat_history_user_id")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_chat_history_created_at ON chat_history(created_at)")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_feedback_message_id ON feedback(message_id)")
     
     conn.commit()
     conn.close()
 
+def get_connection() -> sqlite3.Connection:
+    """Get the shared SQLite connection, opening it on first use"""
+    global _conn
+    if _conn is None:
+        os.makedirs("data", exist_ok=True)
+        # Autocommit connection in WAL mode: readers no longer block on the writer
+        conn = sqlite3.connect(DB_PATH, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA mmap_size=268435456")
+        _conn = conn
+    return _conn
+
 # Initialize database on module load
 init_database()
 
@@ -80,11 +99,11 @@ init_database()
 async def store_chat_history(request: ChatHistoryRequest):
     """Store a chat message and reply in the database"""
     try:
-        conn = sqlite3.connect(DB_PATH)
+        conn = get_connection()
         cursor = conn.cursor()
         
         # Convert meta to JSON string if provided
-        meta_json = json.dumps(request.meta) if request.meta else None
+        meta_json = orjson.dumps(request.meta).decode() if request.meta else None
         
         cursor.execute("""
             INSERT INTO chat_history (user_id, message, reply, meta)
@@ -93,7 +112,6 @@ async def store_chat_history(request: ChatHistoryRequest):
         
         message_id = cursor.lastrowid
         conn.commit()
-        conn.close()
         
         # Return the stored record
         return ChatHistoryResponse(
@@ -115,7 +133,7 @@ async def get_chat_history(
 ):
     """Get chat history for a specific user"""
     try:
-        conn = sqlite3.connect(DB_PATH)
+        conn = get_connection()
         cursor = conn.cursor()
         
         # Get total count
@@ -132,12 +150,11 @@ async def get_chat_history(
         """, (user_id, limit))
         
         rows = cursor.fetchall()
-        conn.close()
         
         messages = []
         for row in rows:
             id_val, user_id_val, message, reply, meta_json, created_at = row
-            meta = json.loads(meta_json) if meta_json else None
+            meta = orjson.loads(meta_json) if meta_json else None
             
             messages.append(ChatHistoryResponse(
                 id=id_val,
@@ -159,7 +176,7 @@ async def clear_chat_history(
 ):
     """Clear chat history for a specific user"""
     try:
-        conn = sqlite3.connect(DB_PATH)
+        conn = get_connection()
         cursor = conn.cursor()
         
         # Delete from chat_history table
@@ -167,7 +184,6 @@ async def clear_chat_history(
         deleted_count = cursor.rowcount
         
         conn.commit()
-        conn.close()
         
         return {
             "message": f"Cleared {deleted_count} messages for user {user_id}",
@@ -183,21 +199,17 @@ async def get_chat_stats(
 ):
     """Get chat statistics"""
     try:
-        conn = sqlite3.connect(DB_PATH)
+        conn = get_connection()
         cursor = conn.cursor()
         
         if user_id:
-            # Get stats for specific user
-            cursor.execute("SELECT COUNT(*) FROM chat_history WHERE user_id = ?", (user_id,))
-            user_count = cursor.fetchone()[0]
-            
+            # Get stats for specific user in a single scan
             cursor.execute("""
-                SELECT MIN(created_at), MAX(created_at)
+                SELECT COUNT(*), MIN(created_at), MAX(created_at)
                 FROM chat_history
                 WHERE user_id = ?
             """, (user_id,))
-            result = cursor.fetchone()
-            first_message, last_message = result
+            user_count, first_message, last_message = cursor.fetchone()
             
             return {
                 "user_id": user_id,
@@ -206,16 +218,12 @@ async def get_chat_stats(
                 "last_message": last_message
             }
         else:
-            # Get global stats
-            cursor.execute("SELECT COUNT(*) FROM chat_history")
-            total_messages = cursor.fetchone()[0]
-            
-            cursor.execute("SELECT COUNT(DISTINCT user_id) FROM chat_history")
-            unique_users = cursor.fetchone()[0]
-            
-            cursor.execute("SELECT MIN(created_at), MAX(created_at) FROM chat_history")
-            result = cursor.fetchone()
-            first_message, last_message = result
+            # Get global stats in a single scan
+            cursor.execute("""
+                SELECT COUNT(*), COUNT(DISTINCT user_id), MIN(created_at), MAX(created_at)
+                FROM chat_history
+            """)
+            total_messages, unique_users, first_message, last_message = cursor.fetchone()
             
             return {
                 "total_messages": total_messages,
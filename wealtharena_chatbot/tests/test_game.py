@@ -0,0 +1,316 @@
+"""
+Test cases for the WealthArena game engine
+Price lookups, metrics, history cache and trading state
+"""
+
+from datetime import date, timedelta
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+import pytest
+from httpx import AsyncClient
+
+from app.api import game
+
+SYMBOLS = ["SPY", "QQQ", "AAPL", "MSFT", "GOOGL", "AMZN", "TSLA", "NVDA", "META", "NFLX"]
+EPISODE = next(ep for ep in game.EPISODES if ep["id"] == "covid_crash_2020")  # 2020-02-19 (Wed) to 2020-04-07 (Tue)
+
+
+def _fake_download(tickers, start=None, end=None, **kwargs):
+    """Stub yf.download: business-day closes of 100 + i (+ 10 per symbol), grouped by ticker"""
+    index = pd.bdate_range(start, end)
+    return pd.concat({
+        symbol: pd.DataFrame({"Close": 100.0 + 10 * n + np.arange(len(index))}, index=index)
+        for n, symbol in enumerate(tickers)
+    }, axis=1)
+
+
+def _price_arrays(start: str, end: str) -> dict:
+    """Episode cache entry for business days in [start, end] with closes 0, 1, 2, ..."""
+    dates = pd.bdate_range(start, end).values.astype("datetime64[D]")
+    return game._to_price_arrays(dates, np.arange(len(dates), dtype=np.float64), EPISODE)
+
+
+@pytest.fixture
+def episode_cache(tmp_path, monkeypatch):
+    """Empty episode cache with yf.download stubbed and data/ under tmp_path"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(game, "HIST_CACHE_DIR", tmp_path / "hist_cache")
+    with patch.dict(game.episode_data_cache, clear=True), \
+         patch.dict(game._episode_fetch_failures, clear=True), \
+         patch("app.api.game.yf.download", side_effect=_fake_download) as download:
+        yield download
+
+
+class TestPriceLookup:
+    """Test cases for the per-episode lookup table"""
+
+    def test_trading_day_returns_its_close(self):
+        """Test that a trading day inside the episode returns that day's close"""
+        data = {"SPY": _price_arrays("2020-02-10", "2020-04-07")}
+
+        # 2020-02-19 is the 8th business day from 2020-02-10
+        assert game._get_price_for_date(data, "SPY", date(2020, 2, 19)) == 7.0
+
+    def test_weekend_forward_fills_to_next_trading_day(self):
+        """Test that a weekend inside the episode returns the following Monday's close"""
+        data = {"SPY": _price_arrays("2020-02-10", "2020-04-07")}
+        monday = game._get_price_for_date(data, "SPY", date(2020, 2, 24))
+
+        assert game._get_price_for_date(data, "SPY", date(2020, 2, 22)) == monday
+        assert game._get_price_for_date(data, "SPY", date(2020, 2, 23)) == monday
+
+    def test_before_episode_uses_search_fallback(self):
+        """Test dates before the episode start, outside the lookup table"""
+        data = {"SPY": _price_arrays("2020-02-10", "2020-04-07")}
+
+        # Saturday before the episode -> Monday 2020-02-17
+        assert game._get_price_for_date(data, "SPY", date(2020, 2, 15)) == 5.0
+        # Before the first row -> first row
+        assert game._get_price_for_date(data, "SPY", date(2020, 1, 1)) == 0.0
+
+    def test_last_episode_day(self):
+        """Test the last day of the episode, the last lookup table entry"""
+        data = {"SPY": _price_arrays("2020-02-10", "2020-04-07")}
+
+        assert len(data["SPY"]["lut"]) == (date(2020, 4, 7) - date(2020, 2, 19)).days + 1
+        assert game._get_price_for_date(data, "SPY", date(2020, 4, 7)) == float(len(data["SPY"]["dates"]) - 1)
+
+    def test_after_last_trading_day_returns_none(self):
+        """Test that no price is returned past the last trading day, inside or after the episode"""
+        data = {"SPY": _price_arrays("2020-02-10", "2020-04-03")}  # Data ends Friday before the episode end
+
+        assert game._get_price_for_date(data, "SPY", date(2020, 4, 3)) == float(len(data["SPY"]["dates"]) - 1)
+        assert game._get_price_for_date(data, "SPY", date(2020, 4, 6)) is None
+        assert game._get_price_for_date(data, "SPY", date(2020, 4, 7)) is None
+        assert game._get_price_for_date(data, "SPY", date(2020, 4, 8)) is None
+
+    def test_lookup_table_matches_binary_search(self):
+        """Test that every in-episode lookup matches a search of the sorted dates"""
+        prices = _price_arrays("2020-02-10", "2020-04-03")
+        data = {"SPY": prices}
+
+        day = date(2020, 2, 19)
+        while day <= date(2020, 4, 7):
+            i = int(np.searchsorted(prices["dates"], np.datetime64(day)))
+            expected = None if i == len(prices["dates"]) else float(prices["close"][i])
+            assert game._get_price_for_date(data, "SPY", day) == expected
+            day += timedelta(days=1)
+
+    def test_unknown_symbol_returns_none(self):
+        """Test that a symbol missing from the episode returns None"""
+        data = {"SPY": _price_arrays("2020-02-10", "2020-04-07")}
+
+        assert game._get_price_for_date(data, "MSFT", date(2020, 2, 19)) is None
+
+
+class TestMetrics:
+    """Test cases for SMA and score calculations"""
+
+    def test_sma_window_boundary(self):
+        """Test that SMA needs 'period' rows up to and including the target date"""
+        prices = _price_arrays("2020-02-10", "2020-04-07")  # Closes 0, 1, 2, ...
+        dates = prices["dates"].astype(object)
+
+        # Row 8 is the 9th data point: not enough for SMA10
+        assert game._calculate_sma(prices, dates[8], 10) is None
+        # Row 9 is the 10th: mean of closes 0..9
+        assert game._calculate_sma(prices, dates[9], 10) == 4.5
+        # Row 14: mean of closes 5..14
+        assert game._calculate_sma(prices, dates[14], 10) == 9.5
+
+    def test_sma_uses_last_trading_day_on_weekend(self):
+        """Test that a weekend target uses rows up to the preceding Friday"""
+        prices = _price_arrays("2020-02-10", "2020-04-07")
+
+        # 2020-02-21 (Fri) is row 9; the weekend after it has no new rows
+        friday = game._calculate_sma(prices, date(2020, 2, 21), 10)
+        assert game._calculate_sma(prices, date(2020, 2, 22), 10) == friday == 4.5
+
+    @pytest.mark.parametrize("args,expected", [
+        ((0, 0, 0, 0), 50.0),
+        ((20, 1, 10, 5), 60 + 10 - 2 + 0.5),
+        ((500, 0, 0, 0), 100.0),  # Return clamped to 100
+        ((-500, 0, 0, 0), 0.0),  # Return clamped to -100
+        ((0, 5, 0, 0), 70.0),  # Sharpe bonus capped at 20
+        ((0, -1, 0, 0), 50.0),  # Negative Sharpe gives no bonus
+        ((0, 0, 500, 0), 30.0),  # Drawdown penalty capped at 20
+        ((0, 0, 0, 1000), 60.0),  # Activity bonus capped at 10
+        ((100, 2, 0, 100), 100.0),  # Final score clamped to 100
+    ])
+    def test_score(self, args, expected):
+        """Test score components and clamps"""
+        assert game._calculate_score(*args) == pytest.approx(expected)
+
+    @pytest.mark.asyncio
+    async def test_failed_performance_metrics_are_not_memoized(self, episode_cache):
+        """Test that an error computing metrics returns (0, 0) without caching it for the episode"""
+        await game._load_episode_data(EPISODE["id"])
+        game._episode_sharpe_dd.cache_clear()
+
+        with patch("app.api.game._episode_window", side_effect=ValueError("bad history")):
+            assert game._calculate_performance_metrics(EPISODE) == (0.0, 0.0)
+
+        sharpe_ratio, max_drawdown = game._calculate_performance_metrics(EPISODE)
+        game._episode_sharpe_dd.cache_clear()
+
+        assert sharpe_ratio > 0
+        assert max_drawdown == 0.0  # Stub closes only rise
+
+
+class TestEpisodeData:
+    """Test cases for loading episode history and its on-disk cache"""
+
+    def test_arrow_cache_round_trip(self, tmp_path, monkeypatch):
+        """Test that the Arrow cache reads back the same dates and closes per symbol"""
+        pytest.importorskip("pyarrow")
+        monkeypatch.setattr(game, "HIST_CACHE_DIR", tmp_path)
+        episode_data = {
+            "SPY": _price_arrays("2020-02-10", "2020-04-07"),
+            "AAPL": _price_arrays("2020-02-19", "2020-03-20"),
+        }
+
+        game._write_episode_cache(EPISODE["id"], episode_data)
+        game._write_episode_cache(EPISODE["id"], episode_data)
+        cached = game._read_episode_cache(EPISODE["id"])
+
+        # Temp files are renamed into place, never left behind
+        assert [path.name for path in tmp_path.iterdir()] == [f"{EPISODE['id']}.arrow"]
+        assert cached.keys() == episode_data.keys()
+        for symbol, (dates, close) in cached.items():
+            assert dates.dtype == np.dtype("datetime64[D]")
+            assert close.dtype == np.float64
+            np.testing.assert_array_equal(dates, episode_data[symbol]["dates"])
+            np.testing.assert_array_equal(close, episode_data[symbol]["close"])
+
+    def test_missing_cache_file(self, tmp_path, monkeypatch):
+        """Test that reading an episode that was never cached returns None"""
+        monkeypatch.setattr(game, "HIST_CACHE_DIR", tmp_path)
+
+        assert game._read_episode_cache(EPISODE["id"]) is None
+
+    @pytest.mark.asyncio
+    async def test_restart_reads_cache_instead_of_fetching(self, episode_cache):
+        """Test that a complete fetch is cached on disk and reused after a restart"""
+        pytest.importorskip("pyarrow")
+        await game._load_episode_data(EPISODE["id"])
+        fetched = game.episode_data_cache.pop(EPISODE["id"])
+
+        await game._load_episode_data(EPISODE["id"])
+
+        assert episode_cache.call_count == 1
+        assert game.episode_data_cache[EPISODE["id"]].keys() == fetched.keys() == set(SYMBOLS)
+
+    @pytest.mark.asyncio
+    async def test_partial_fetch_is_not_cached_on_disk(self, episode_cache):
+        """Test that a fetch missing symbols is used in memory but refetched after a restart"""
+        episode_cache.side_effect = lambda tickers, **kwargs: _fake_download(tickers[:3], **kwargs)
+        await game._load_episode_data(EPISODE["id"])
+
+        assert game.episode_data_cache[EPISODE["id"]].keys() == {"SPY", "QQQ", "AAPL"}
+        assert not (game.HIST_CACHE_DIR / f"{EPISODE['id']}.arrow").exists()
+
+        episode_cache.side_effect = _fake_download
+        game.episode_data_cache.clear()
+        await game._load_episode_data(EPISODE["id"])
+
+        assert episode_cache.call_count == 2
+        assert game.episode_data_cache[EPISODE["id"]].keys() == set(SYMBOLS)
+
+    @pytest.mark.asyncio
+    async def test_failed_fetch_backs_off(self, episode_cache):
+        """Test that a failed fetch isn't retried until the retry interval has passed"""
+        episode_cache.side_effect = RuntimeError("Yahoo unavailable")
+        for _ in range(5):
+            await game._load_episode_data(EPISODE["id"])
+
+        assert episode_cache.call_count == 1
+        assert EPISODE["id"] not in game.episode_data_cache
+
+        episode_cache.side_effect = _fake_download
+        game._episode_fetch_failures[EPISODE["id"]] -= game.EPISODE_FETCH_RETRY_INTERVAL
+        await game._load_episode_data(EPISODE["id"])
+
+        assert episode_cache.call_count == 2
+        assert EPISODE["id"] in game.episode_data_cache
+
+
+class TestTrading:
+    """Test cases for trades against the holdings index"""
+
+    async def _trade(self, async_client: AsyncClient, game_id: str, symbol: str, side: str, qty: int) -> dict:
+        """Place a market order and return the response body"""
+        response = await async_client.post("/v1/game/trade", json={
+            "game_id": game_id,
+            "symbol": symbol,
+            "side": side,
+            "qty": qty,
+            "type": "market"
+        })
+        assert response.status_code == 200
+        return response.json()
+
+    def _assert_index_consistent(self, game_id: str) -> None:
+        """Check the index holds exactly the portfolio's holding dicts"""
+        holdings = game.game_states[game_id]["portfolio"]["holdings"]
+        index = game.holdings_index[game_id]
+
+        assert index.keys() == {holding["symbol"] for holding in holdings}
+        assert all(index[holding["symbol"]] is holding for holding in holdings)
+
+    @pytest.mark.asyncio
+    async def test_holdings_index_across_buy_and_sell(self, async_client: AsyncClient, episode_cache):
+        """Test that the holdings index tracks buys, partial sells and full sells"""
+        response = await async_client.post("/v1/game/start", json={
+            "user_id": "test_user",
+            "episode_id": EPISODE["id"],
+            "difficulty": "easy"
+        })
+        assert response.status_code == 200
+        game_id = response.json()["game_id"]
+
+        await self._trade(async_client, game_id, "AAPL", "buy", 10)
+        await self._trade(async_client, game_id, "AAPL", "buy", 5)
+        await self._trade(async_client, game_id, "MSFT", "buy", 3)
+        self._assert_index_consistent(game_id)
+        assert game.holdings_index[game_id]["AAPL"]["shares"] == 15
+
+        # Partial sell keeps the holding
+        await self._trade(async_client, game_id, "AAPL", "sell", 5)
+        self._assert_index_consistent(game_id)
+        assert game.holdings_index[game_id]["AAPL"]["shares"] == 10
+
+        # Full sell removes it from both the list and the index
+        data = await self._trade(async_client, game_id, "AAPL", "sell", 10)
+        self._assert_index_consistent(game_id)
+        assert "AAPL" not in game.holdings_index[game_id]
+        assert [holding["symbol"] for holding in data["portfolio"]["holdings"]] == ["MSFT"]
+
+        # Selling a symbol no longer held is rejected
+        response = await async_client.post("/v1/game/trade", json={
+            "game_id": game_id,
+            "symbol": "AAPL",
+            "side": "sell",
+            "qty": 1,
+            "type": "market"
+        })
+        assert response.status_code == 400
+
+    @pytest.mark.asyncio
+    async def test_tick_returns_float_pnl_without_holdings(self, async_client: AsyncClient, episode_cache):
+        """Test that tick P&L is a float (0.0, not 0) when there are no holdings"""
+        response = await async_client.post("/v1/game/start", json={
+            "user_id": "test_user",
+            "episode_id": EPISODE["id"],
+            "difficulty": "easy"
+        })
+        game_id = response.json()["game_id"]
+
+        response = await async_client.post("/v1/game/tick", json={"game_id": game_id})
+        assert response.status_code == 200
+        data = response.json()
+
+        assert data["prices"] == []
+        assert isinstance(data["pnl"], float)
+        assert isinstance(data["total_pnl"], float)
@@ -43,7 +43,21 @@ class DatabaseService:
         """Initialize AzureSQL connection"""
         try:
             from sqlalchemy import create_engine
-            self.engine = create_engine(self.connection_string)
+            
+            # One pooled engine per service: connections are reused across calls
+            # instead of paying the TCP/auth handshake each time. Azure SQL drops
+            # idle connections after ~30 min, so recycle before that and ping on checkout.
+            engine_kwargs = {
+                "pool_size": 5,
+                "max_overflow": 10,
+                "pool_recycle": 1800,
+                "pool_pre_ping": True,
+            }
+            if self.connection_string.startswith("mssql+pyodbc"):
+                # Send executemany() batches (e.g. DataFrame.to_sql) as one array-bound call
+                engine_kwargs["fast_executemany"] = True
+            
+            self.engine = create_engine(self.connection_string, **engine_kwargs)
             logger.info("✅ Connected to AzureSQL")
         except Exception as e:
             logger.error(f"Failed to connect to AzureSQL: {e}")